@@ -2,176 +2,246 @@
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
-from PIL import Image, ImageTk, ImageOps
-import io
+from PIL import Image, ImageTk
+import array
+import mmap
 import os
-import struct
+import re
+import sys
+import threading
 import time
 
+try:
+    import numpy as np
+except ImportError:
+    # bez NumPy dekodujemy wolniejszymi ścieżkami ze standardowej biblioteki
+    np = None
+
+# PPM_DEBUG=1 w środowisku włącza komunikaty o czasie wczytywania
+DEBUG = bool(os.environ.get('PPM_DEBUG'))
+
+# górny limit rozmiaru danych pikseli - chroni przed nagłówkami z absurdalnymi wymiarami
+MAX_ALLOC = 2 * 1024 ** 3
+
+# komentarz PPM: od '#' do końca linii
+_PPM_COMMENT = re.compile(rb'#[^\n]*')
+
 class PPMFormatError(Exception):
     pass
 
 def _read_header_tokens(f):
-
+    # czytamy bajt po bajcie, żeby zatrzymać się dokładnie za pojedynczym
+    # białym znakiem po maxval - tam zaczynają się dane pikseli
     tokens = []
+    token = bytearray()
     while len(tokens) < 4:
-        line = f.readline()
-        if not line:
+        c = f.read(1)
+        if not c:
+            if token:
+                tokens.append(token.decode('latin1'))
             break
-        try:
-            s = line.decode('ascii')
-        except Exception:
-            s = line.decode('latin1')
-        # remove comments
-        if '#' in s:
-            s = s.split('#', 1)[0]
-        # split whitespace
-        parts = s.split()
-        tokens.extend(parts)
+        if c == b'#':
+            # komentarz do końca linii rozdziela tokeny jak biały znak
+            f.readline()
+            c = b'\n'
+        if c.isspace():
+            if token:
+                tokens.append(token.decode('latin1'))
+                token = bytearray()
+        else:
+            token += c
     if len(tokens) < 4:
         raise PPMFormatError("Nie udało się odczytać nagłówka PPM (brak wymaganych pól).")
-    return tokens[:4]  # magic, width, height, maxval
+    return tokens  # magic, width, height, maxval
 
 def timed(func):
     """Dekorator do pomiaru czasu wykonania funkcji (do debugowania)."""
+    if not DEBUG:
+        return func
     def wrapper(*args, **kwargs):
-        start = time.perf_counter()
+        start = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end = time.perf_counter()
-        print(f"[DEBUG] {func.__name__} wykonano w {end - start:.3f} sekundy.")
+        end = time.perf_counter_ns()
+        print(f"[DEBUG] {func.__name__} wykonano w {(end - start) / 1e9:.3f} sekundy.")
         return result
     return wrapper
 
+def _scale_lut(maxval, size):
+    # tablica przejścia z zakresu 0..maxval na 0..255 (zaokrąglenie w górę od połowy);
+    # indeksy powyżej maxval wypełnione 255, więc nie trzeba osobno przycinać próbek
+    n = min(size, maxval + 1)
+    if np is None:
+        return bytes((i * 255 + maxval // 2) // maxval for i in range(n)) + b'\xff' * (size - n)
+    lut = np.full(size, 255, dtype=np.uint8)
+    lut[:n] = (np.arange(n, dtype=np.uint32) * 255 + maxval // 2) // maxval
+    return lut
+
 @timed
-def read_ppm(path):
-    with open(path, 'rb') as f:
-        first = f.readline()
-        if not first:
-            raise PPMFormatError("Pusty plik.")
-        try:
-            magic = first.decode('ascii').strip()
-        except Exception:
-            magic = first.decode('latin1').strip()
-        if magic not in ('P3', 'P6'):
-            raise PPMFormatError(f"Niedozwolony magic header: {magic}. Oczekiwano P3 lub P6.")
-        if magic == 'P3':
-            content = f.read().decode('ascii', errors='ignore')
-            lines = []
-            for line in content.splitlines():
-                if '#' in line:
-                    line = line.split('#', 1)[0]
-                if line.strip():
-                    lines.append(line)
-            tokens = ' '.join(lines).split()
-            if len(tokens) < 3:
-                raise PPMFormatError("Brak nagłówka (width height maxval)")
-            width = int(tokens[0])
-            height = int(tokens[1])
-            maxval = int(tokens[2])
-            data_tokens = tokens[3:]
-            expected = width * height * 3
-            if len(data_tokens) != expected:
-                raise PPMFormatError(f"Nieoczekiwana liczba próbek: {len(data_tokens)} != {expected}")
-            samples = list(map(int, data_tokens))
-            if maxval != 255:
-                scale = 255.0 / maxval
-                samples = bytes(int(round(v * 255.0 / maxval)) if maxval != 255 else v for v in samples)
-            data = bytes(samples)
+def _read_ppm_from_stream(f):
+    magic, width, height, maxval = _read_header_tokens(f)
+    if magic not in ('P3', 'P6'):
+        raise PPMFormatError(f"Niedozwolony magic header: {magic}. Oczekiwano P3 lub P6.")
+    try:
+        width = int(width)
+        height = int(height)
+        maxval = int(maxval)
+    except Exception as e:
+        raise PPMFormatError(f"Błąd parsowania width/height/maxval ({magic}).") from e
+    if width <= 0 or height <= 0:
+        raise PPMFormatError("Nieprawidłowe wymiary obrazu.")
+    if not (1 <= maxval <= 65535):
+        raise PPMFormatError("maxval poza zakresem (1..65535).")
+    if maxval < 256:
+        bps = 1
+    else:
+        bps = 2
+    total_samples = width * height * 3
+    total_bytes = total_samples * bps
+    if total_bytes > MAX_ALLOC:
+        raise PPMFormatError(f"Obraz zbyt duży: {total_bytes} bajtów (limit {MAX_ALLOC}).")
+    if magic == 'P3':
+        content = f.read()
+        # większość plików nie ma komentarzy w danych - wtedy bez dodatkowej kopii
+        if b'#' in content:
+            content = _PPM_COMMENT.sub(b'', content)
+        if np is None:
+            tokens = content.split()
+            if len(tokens) != total_samples:
+                raise PPMFormatError(f"Nieoczekiwana liczba próbek: {len(tokens)} != {total_samples}")
+            lut = _scale_lut(maxval, maxval + 1)
+            data = None
+            # szybka ścieżka: bytes(map(...)) bez generatora; próbki spoza zakresu
+            # (ujemne wykluczamy z góry, bo indeksowałyby lut od końca) zgłaszają wyjątek
+            if b'-' not in content:
+                try:
+                    if maxval == 255:
+                        data = bytes(map(int, tokens))
+                    else:
+                        data = bytes(map(lut.__getitem__, map(int, tokens)))
+                except (ValueError, IndexError):
+                    pass
+            if data is None:
+                try:
+                    data = bytes(lut[min(max(int(t), 0), maxval)] for t in tokens)
+                except ValueError as e:
+                    raise PPMFormatError("Nieprawidłowa próbka w danych P3.") from e
             img = Image.frombytes('RGB', (width, height), data)
             return img
+        try:
+            samples = np.fromstring(content, dtype=np.int64, sep=' ')
+        except ValueError as e:
+            raise PPMFormatError("Nieprawidłowa próbka w danych P3.") from e
+        if samples.size != total_samples:
+            raise PPMFormatError(f"Nieoczekiwana liczba próbek: {samples.size} != {total_samples}")
+        samples = np.clip(samples, 0, maxval)
+        if maxval == 255:
+            data = samples.astype(np.uint8)
+        else:
+            data = _scale_lut(maxval, maxval + 1)[samples]
+        img = Image.frombuffer('RGB', (width, height), data, 'raw', 'RGB', 0, 1)
+        return img
 
+    else:
+        # dane pikseli mapujemy z pliku zamiast kopiować je do pamięci;
+        # mapowanie zwalnia się razem z ostatnim widokiem po wyjściu z funkcji
+        data_offset = f.tell()
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # strumień bez mapowalnego deskryptora (np. io.BytesIO, potok) - jeden odczyt całego bloku
+            buf = f.read(total_bytes)
         else:
-            f.seek(0)
-            tokens = []
-            while len(tokens) < 4:
-                line = f.readline()
-                if not line:
-                    break
-                try:
-                    s = line.decode('ascii')
-                except Exception:
-                    s = line.decode('latin1')
-                if '#' in s:
-                    s = s.split('#', 1)[0]
-                parts = s.split()
-                if parts:
-                    tokens.extend(parts)
-            if len(tokens) < 4:
-                raise PPMFormatError("Nie udało się odczytać nagłówka P6.")
-            try:
-                width = int(tokens[1])
-                height = int(tokens[2])
-                maxval = int(tokens[3])
-            except Exception as e:
-                raise PPMFormatError("Błąd parsowania width/height/maxval (P6).") from e
-            if width <= 0 or height <= 0:
-                raise PPMFormatError("Nieprawidłowe wymiary obrazu.")
-            if not (1 <= maxval <= 65535):
-                raise PPMFormatError("maxval poza zakresem (1..65535).")
-            if maxval < 256:
-                bps = 1
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                # dane czytamy jednym przebiegiem od początku - agresywniejszy read-ahead
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            buf = memoryview(mm)[data_offset:data_offset + total_bytes]
+        if len(buf) != total_bytes:
+            raise PPMFormatError(f"Nieoczekiwana liczba bajtów pikseli w P6: odczytano {len(buf)}, oczekiwano {total_bytes}")
+        if bps == 1:
+            if maxval == 255:
+                # bez pośredniej kopii w bytes; Pillow sam przechowuje referencję
+                # do bufora, jeśli go nie skopiuje, więc mapowanie pozostaje ważne
+                img = Image.frombuffer('RGB', (width, height), buf, 'raw', 'RGB', 0, 1)
+                return img
+            lut = _scale_lut(maxval, 256)
+            if np is None:
+                data = bytes(buf).translate(lut)
             else:
-                bps = 2
-            total_samples = width * height * 3
-            total_bytes = total_samples * bps
-            remaining = total_bytes
-            buf = bytearray()
-            block_size = 64 * 1024
-            while remaining > 0:
-                to_read = min(block_size, remaining)
-                chunk = f.read(to_read)
-                if not chunk:
-                    break
-                buf.extend(chunk)
-                remaining -= len(chunk)
-            if len(buf) != total_bytes:
-                raise PPMFormatError(f"Nieoczekiwana liczba bajtów pikseli w P6: odczytano {len(buf)}, oczekiwano {total_bytes}")
-            if bps == 1:
-                if maxval == 255:
-                    data = bytes(buf)
+                data = lut[np.frombuffer(buf, dtype=np.uint8)]
+            img = Image.frombuffer('RGB', (width, height), data, 'raw', 'RGB', 0, 1)
+            return img
+        else:
+            # próbki 16-bitowe zapisane big-endian (najstarszy bajt pierwszy)
+            if maxval == 65535:
+                # pełny zakres 16 bitów: wynik to po prostu starszy bajt próbki
+                if np is None:
+                    out = memoryview(buf)[::2].tobytes()
                 else:
-                    scale = 255.0 / maxval
-                    data = bytes([int(round(b * scale)) for b in buf])
-                img = Image.frombytes('RGB', (width, height), data)
-                return img
+                    out = np.ascontiguousarray(np.frombuffer(buf, dtype=np.uint8)[::2])
             else:
-                scale = 255.0 / maxval
-                samples8 = bytearray(total_samples)
-                mv = memoryview(buf)
-                idx_out = 0
-                for i in range(0, total_bytes, 2):
-                    hi = mv[i]
-                    lo = mv[i+1]
-                    val = (hi << 8) | lo
-                    if val < 0:
-                        val = 0
-                    elif val > maxval:
-                        val = maxval
-                    samples8[idx_out] = int(round(val * scale))
-                    idx_out += 1
-                img = Image.frombytes('RGB', (width, height), bytes(samples8))
-                return img
+                # jedno odczytanie z tablicy 64K na próbkę zamiast mnożenia i dzielenia
+                lut = _scale_lut(maxval, 65536)
+                if np is None:
+                    # array('H') trzyma próbki po 2 bajty, bez obiektu int na każdą
+                    samples = array.array('H')
+                    samples.frombytes(buf)
+                    if sys.byteorder == 'little':
+                        samples.byteswap()
+                    out = bytes(map(lut.__getitem__, samples))
+                else:
+                    out = lut[np.frombuffer(buf, dtype=np.dtype('>u2'))]
+            img = Image.frombuffer('RGB', (width, height), out, 'raw', 'RGB', 0, 1)
+            return img
+
+def read_ppm(path):
+    with open(path, 'rb') as f:
+        return _read_ppm_from_stream(f)
+
+# sygnatury rozpoznawane po pierwszych bajtach pliku
+_MAGIC_FORMATS = (
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'GIF87a', 'GIF'),
+    (b'GIF89a', 'GIF'),
+)
 
 def read_image_general(path):
     with open(path, 'rb') as f:
-        head = f.read(2)
-    try:
-        head_str = head.decode('ascii', errors='ignore')
-    except:
-        head_str = ''
-    if head_str in ('P3', 'P6'):
-        return read_ppm(path)
-    try:
-        im = Image.open(path)
-        im = im.convert('RGB')
-        return im
-    except Exception as e:
-        raise IOError(f"Nie można wczytać pliku jako PPM ani obraz przez Pillow: {e}")
+        # peek nie przesuwa pozycji, więc parser dostaje strumień od początku bez seek
+        head = f.peek(12)[:12]
+        if head[:2] in (b'P3', b'P6'):
+            return _read_ppm_from_stream(f)
+        formats = None
+        for magic, fmt in _MAGIC_FORMATS:
+            if head.startswith(magic):
+                formats = [fmt]
+                break
+        try:
+            im = Image.open(f, formats=formats)
+            im.load()
+            # JPEG zwykle jest już w RGB - konwersja byłaby tylko kopią pikseli
+            if im.mode != 'RGB':
+                im = im.convert('RGB')
+            return im
+        except Exception as e:
+            raise IOError(f"Nie można wczytać pliku jako PPM ani obraz przez Pillow: {e}")
 
-def save_as_jpeg(image, path, quality=85):
+def save_as_jpeg(image, path, quality=85, optimize=False, progressive=False, subsampling='4:2:0'):
+    # optimize=True to drugi przebieg budujący optymalne tablice Huffmana (~2x wolniej);
+    # przy zapisie interaktywnym wystarcza jednoprzebiegowe kodowanie
     if not (1 <= quality <= 95):
         raise ValueError("Quality musi być w zakresie 1..95.")
-    image.save(path, format='JPEG', quality=quality, optimize=True)
+    image.save(path, format='JPEG', quality=quality, optimize=optimize, progressive=progressive, subsampling=subsampling)
+
+def build_pyramid(image):
+    # kolejne poziomy o połowę mniejsze; pomniejszenia liczymy od najbliższego z nich
+    pyramid = [image]
+    last = image
+    # dopóki którykolwiek bok > 512, żeby bardzo szerokie/wysokie obrazy też miały poziomy
+    while last.width > 512 or last.height > 512:
+        last = last.resize((max(1, last.width // 2), max(1, last.height // 2)), Image.BOX)
+        pyramid.append(last)
+    return pyramid
 
 class ImageViewer(tk.Frame):
     def __init__(self, master):
@@ -185,6 +255,19 @@ class ImageViewer(tk.Frame):
         self.offset_x = 0
         self.offset_y = 0
         self.drag_start = None
+        self._resize_key = None
+        self._pyramid = []
+        self._tk_dims = None
+        self._view_origin = (0, 0)
+        self._scroll_dims = None
+        self.canvas_image_id = None
+        self._pix = None
+        self._motion_pos = None
+        self._motion_scheduled = False
+        self._redraw_scheduled = False
+        self._pending_zoom = 1.0
+        self._zoom_after_id = None
+        self._load_token = 0
         self.build_ui()
 
     def build_ui(self):
@@ -194,8 +277,8 @@ class ImageViewer(tk.Frame):
         btn_open = tk.Button(toolbar, text="Otwórz...", command=self.open_file)
         btn_open.pack(side=tk.LEFT, padx=4, pady=4)
 
-        btn_save_jpeg = tk.Button(toolbar, text="Zapisz jako JPEG...", command=self.save_jpeg)
-        btn_save_jpeg.pack(side=tk.LEFT, padx=4, pady=4)
+        self.btn_save_jpeg = tk.Button(toolbar, text="Zapisz jako JPEG...", command=self.save_jpeg)
+        self.btn_save_jpeg.pack(side=tk.LEFT, padx=4, pady=4)
 
         tk.Label(toolbar, text="Zoom:").pack(side=tk.LEFT, padx=(8,0))
         self.zoom_var = tk.DoubleVar(value=1.0)
@@ -223,12 +306,32 @@ class ImageViewer(tk.Frame):
         filepath = filedialog.askopenfilename(title="Wybierz plik (PPM P3/P6 lub JPEG)", filetypes=[("Images", "*.ppm *.PPM *.jpg *.jpeg *.JPG *.JPEG"), ("All files", "*.*")])
         if not filepath:
             return
+        # dekodowanie i piramida w osobnym wątku; wynik wraca do pętli Tk przez after
+        self._load_token += 1
+        self.info_label.config(text=f"Wczytywanie: {os.path.basename(filepath)}...")
+        t = threading.Thread(target=self._do_load_file, args=(filepath, self._load_token), daemon=True)
+        t.start()
+
+    def _do_load_file(self, filepath, token):
         try:
             img = read_image_general(filepath)
+            # PixelAccess czyta wprost z pamięci obrazu, bez drugiej kopii pikseli
+            result = (img, img.load(), build_pyramid(img))
         except Exception as e:
-            messagebox.showerror("Błąd", f"Nie można wczytać pliku:\n{e}")
+            self.after(0, self._on_file_loaded, filepath, token, None, e)
+        else:
+            self.after(0, self._on_file_loaded, filepath, token, result, None)
+
+    def _on_file_loaded(self, filepath, token, result, error):
+        # wynik starszego wczytywania, jeśli w międzyczasie otwarto kolejny plik
+        if token != self._load_token:
             return
-        self.image = img
+        if error is not None:
+            self.info_label.config(text=f"Nie udało się wczytać: {os.path.basename(filepath)}")
+            messagebox.showerror("Błąd", f"Nie można wczytać pliku:\n{error}")
+            return
+        self.image, self._pix, self._pyramid = result
+        self._resize_key = None
         self.zoom = 1.0
         self.offset_x = 0
         self.offset_y = 0
@@ -246,42 +349,111 @@ class ImageViewer(tk.Frame):
         path = filedialog.asksaveasfilename(defaultextension=".jpg", filetypes=[("JPEG", "*.jpg;*.jpeg")], title="Zapisz jako JPEG")
         if not path:
             return
+        # kompresja w osobnym wątku, żeby nie blokować interfejsu
+        self.btn_save_jpeg.config(state=tk.DISABLED)
+        t = threading.Thread(target=self._do_save_jpeg, args=(self.image.copy(), path, q), daemon=True)
+        t.start()
+
+    def _do_save_jpeg(self, image, path, quality):
         try:
-            save_as_jpeg(self.image, path, quality=q)
-            messagebox.showinfo("Zapisano", f"Zapisano obraz do {path} (jakość={q}).")
+            save_as_jpeg(image, path, quality=quality)
         except Exception as e:
-            messagebox.showerror("Błąd zapisu", f"Nie udało się zapisać pliku JPEG:\n{e}")
+            self.after(0, self._on_jpeg_saved, path, quality, e)
+        else:
+            self.after(0, self._on_jpeg_saved, path, quality, None)
+
+    def _on_jpeg_saved(self, path, quality, error):
+        self.btn_save_jpeg.config(state=tk.NORMAL)
+        if error is None:
+            messagebox.showinfo("Zapisano", f"Zapisano obraz do {path} (jakość={quality}).")
+        else:
+            messagebox.showerror("Błąd zapisu", f"Nie udało się zapisać pliku JPEG:\n{error}")
+
+    def _image_geometry(self):
+        # lewy górny róg i rozmiar całego powiększonego obrazu we współrzędnych płótna
+        full_w = max(1, int(round(self.image.width * self.zoom)))
+        full_h = max(1, int(round(self.image.height * self.zoom)))
+        left = (self.canvas.winfo_width() // 2) + int(self.offset_x) - full_w // 2
+        top = (self.canvas.winfo_height() // 2) + int(self.offset_y) - full_h // 2
+        return left, top, full_w, full_h
 
     def update_display_image(self):
         if self.image is None:
             return
-        w = int(round(self.image.width * self.zoom))
-        h = int(round(self.image.height * self.zoom))
-        if w < 1: w = 1
-        if h < 1: h = 1
+        # skalujemy tylko fragment obrazu widoczny na płótnie, więc koszt zależy
+        # od rozmiaru okna, a nie od rozmiaru obrazu i zoomu
+        left, top, full_w, full_h = self._image_geometry()
+        canvas_w = self.canvas.winfo_width()
+        canvas_h = self.canvas.winfo_height()
+        x0 = min(max(0, -left), full_w - 1)
+        y0 = min(max(0, -top), full_h - 1)
+        x1 = max(min(full_w, canvas_w - left), x0 + 1)
+        y1 = max(min(full_h, canvas_h - top), y0 + 1)
+        # przy tym samym obrazie, zoomie i widocznym fragmencie wystarczy przerysować płótno
+        key = (id(self.image), round(self.zoom, 4), x0, y0, x1, y1)
+        if key == self._resize_key and self.tkimage is not None:
+            self.redraw_canvas()
+            return
+        source = self.image
+        for level in self._pyramid:
+            if level.width < full_w or level.height < full_h:
+                break
+            source = level
+        sx = source.width / full_w
+        sy = source.height / full_h
+        box = (x0 * sx, y0 * sy, x1 * sx, y1 * sy)
+        size = (x1 - x0, y1 - y0)
         try:
-            self.display_image = self.image.resize((w, h), resample=Image.NEAREST if self.zoom>=1.0 else Image.BILINEAR)
+            if self.zoom >= 1.0:
+                self.display_image = source.resize(size, resample=Image.NEAREST, box=box)
+            else:
+                # reducing_gap: gdy źródło jest ≥6x większe od celu, Pillow najpierw redukuje je
+                # uśrednianiem blokowym w C; przy piramidzie to tylko zabezpieczenie, bez kosztu
+                self.display_image = source.resize(size, resample=Image.BILINEAR, box=box, reducing_gap=3.0)
         except Exception:
-            self.display_image = self.image.copy()
-        self.tkimage = ImageTk.PhotoImage(self.display_image)
+            # zostawiamy poprzedni widok zamiast wstawiać pełną kopię w złej skali i miejscu
+            return
+        self._view_origin = (x0, y0)
+        # istniejący PhotoImage o tych samych wymiarach tylko nadpisujemy
+        dims = self.display_image.size
+        if self.tkimage is not None and self._tk_dims == dims:
+            self.tkimage.paste(self.display_image)
+        else:
+            self.tkimage = ImageTk.PhotoImage(self.display_image)
+            self._tk_dims = dims
+            if self.canvas_image_id is not None:
+                self.canvas.itemconfig(self.canvas_image_id, image=self.tkimage)
+        self._resize_key = key
         self.redraw_canvas()
 
     def redraw_canvas(self):
-        self.canvas.delete("all")
         if self.tkimage is None:
             return
-        canvas_w = self.canvas.winfo_width()
-        canvas_h = self.canvas.winfo_height()
-        x = (canvas_w // 2) + int(self.offset_x)
-        y = (canvas_h // 2) + int(self.offset_y)
-        self.canvas_image_id = self.canvas.create_image(x, y, image=self.tkimage)
-        self.canvas.config(scrollregion=self.canvas.bbox(tk.ALL))
+        left, top, _, _ = self._image_geometry()
+        x = left + self._view_origin[0]
+        y = top + self._view_origin[1]
+        # element obrazu tworzymy raz, potem tylko go przesuwamy
+        if self.canvas_image_id is None:
+            self.canvas_image_id = self.canvas.create_image(x, y, image=self.tkimage, anchor=tk.NW)
+        else:
+            self.canvas.coords(self.canvas_image_id, x, y)
+        if self._scroll_dims != self._tk_dims:
+            self.canvas.config(scrollregion=self.canvas.bbox(tk.ALL))
+            self._scroll_dims = self._tk_dims
 
     def on_zoom_change(self, val):
         try:
-            self.zoom = float(val)
+            self._pending_zoom = float(val)
         except:
-            self.zoom = 1.0
+            self._pending_zoom = 1.0
+        # suwak wysyła serię zdarzeń; skalujemy dopiero po 30 ms spokoju
+        if self._zoom_after_id is not None:
+            self.after_cancel(self._zoom_after_id)
+        self._zoom_after_id = self.after(30, self._apply_pending_zoom)
+
+    def _apply_pending_zoom(self):
+        self._zoom_after_id = None
+        self.zoom = self._pending_zoom
         self.update_display_image()
 
     def fit_to_window(self):
@@ -311,30 +483,43 @@ class ImageViewer(tk.Frame):
         self.offset_x += dx
         self.offset_y += dy
         self.drag_start = (event.x, event.y)
+        # kilka zdarzeń przeciągania między odświeżeniami ekranu daje jedno przesunięcie
+        if not self._redraw_scheduled:
+            self._redraw_scheduled = True
+            self.after_idle(self._do_redraw)
+
+    def _do_redraw(self):
+        self._redraw_scheduled = False
         self.redraw_canvas()
 
     def on_button_release(self, event):
         self.drag_start = None
+        # po przesunięciu dorysowujemy odsłonięty fragment obrazu
+        self.update_display_image()
 
     def on_mouse_move(self, event):
+        # etykietę odświeżamy najwyżej ~30 razy na sekundę, dla ostatniej pozycji kursora
+        self._motion_pos = (event.x, event.y)
+        if self._motion_scheduled:
+            return
+        self._motion_scheduled = True
+        self.after(33, self._do_motion)
+
+    def _do_motion(self):
+        self._motion_scheduled = False
         if self.image is None or self.display_image is None:
             return
-        canvas_w = self.canvas.winfo_width()
-        canvas_h = self.canvas.winfo_height()
-        img_w, img_h = self.display_image.width, self.display_image.height
-        img_center_x = (canvas_w // 2) + int(self.offset_x)
-        img_center_y = (canvas_h // 2) + int(self.offset_y)
-        img_left = img_center_x - img_w // 2
-        img_top = img_center_y - img_h // 2
-        mx = event.x - img_left
-        my = event.y - img_top
+        x, y = self._motion_pos
+        img_left, img_top, img_w, img_h = self._image_geometry()
+        mx = x - img_left
+        my = y - img_top
         if 0 <= mx < img_w and 0 <= my < img_h:
             ox = int(mx / self.zoom)
             oy = int(my / self.zoom)
             ox = min(max(ox, 0), self.image.width - 1)
             oy = min(max(oy, 0), self.image.height - 1)
             try:
-                r,g,b = self.image.getpixel((ox, oy))
+                r,g,b = self._pix[ox, oy]
             except Exception:
                 r,g,b = (0,0,0)
             self.info_label.config(text=f"X={ox} Y={oy}  R={r} G={g} B={b}   Zoom={self.zoom:.2f}")
@@ -344,7 +529,7 @@ class ImageViewer(tk.Frame):
     def on_resize(self, event):
         if self.image is None:
             return
-        self.redraw_canvas()
+        self.update_display_image()
 
 def main():
     root = tk.Tk()